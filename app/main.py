@@ -1,22 +1,23 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
-from typing import List
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request, Response
+from fastapi.exceptions import RequestValidationError
 import json
+from .models import ScoreRequest, ScoreResponse, TrainResponse
 from .services.fasttext_service import FastTextService
+from .utils.serialization import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    LENGTH_PREFIXED_MEDIA_TYPE,
+    FLOAT32_MEDIA_TYPE,
+    SerializationError,
+    UnsupportedMediaTypeError,
+    decode_score_request,
+    negotiate_response_type,
+    encode_scores,
+)
 
 app = FastAPI(title="FastText Classification Service")
 fasttext_service = FastTextService()
 
-class ScoreRequest(BaseModel):
-    model_id: str
-    documents: List[str]
-
-class ScoreResponse(BaseModel):
-    scores: List[float]
-
-class TrainResponse(BaseModel):
-    model_id: str
-
 @app.post("/train", response_model=TrainResponse)
 async def train_model(file: UploadFile = None):
     """Train a FastText classifier using either uploaded positive documents or local data."""
@@ -64,16 +65,64 @@ async def train_model(file: UploadFile = None):
         print(f"DEBUG: Error during training: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
     
-@app.post("/score", response_model=ScoreResponse)
-async def score_documents(request: ScoreRequest):
-    """Score documents using a trained FastText classifier."""
+# The body is decoded by hand so binary formats skip per-string Pydantic validation;
+# the schema is still advertised, and invalid bodies still get FastAPI's 422 response.
+_SCORE_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            JSON_MEDIA_TYPE: {"schema": ScoreRequest.model_json_schema()},
+            MSGPACK_MEDIA_TYPE: {"schema": ScoreRequest.model_json_schema()},
+            LENGTH_PREFIXED_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+        },
+    },
+    "responses": {
+        "200": {
+            "content": {
+                MSGPACK_MEDIA_TYPE: {"schema": ScoreResponse.model_json_schema()},
+                FLOAT32_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}},
+            }
+        },
+        "406": {"description": "Every supported response media type was refused by Accept"},
+        "415": {"description": "Unsupported request Content-Type"},
+        "422": {
+            "description": "Validation Error",
+            "content": {
+                JSON_MEDIA_TYPE: {"schema": {"$ref": "#/components/schemas/HTTPValidationError"}}
+            },
+        },
+    },
+}
+
+@app.post("/score", response_model=ScoreResponse, openapi_extra=_SCORE_OPENAPI)
+async def score_documents(request: Request):
+    """
+    Score documents using a trained FastText classifier.
+
+    The request body may be JSON, msgpack or length-prefixed frames (see Content-Type);
+    scores are returned as JSON, msgpack or a packed little-endian float32 array (see Accept).
+    """
     try:
-        scores = await fasttext_service.score_documents(
-            request.model_id, 
-            request.documents
+        model_id, documents = decode_score_request(
+            await request.body(),
+            request.headers.get("content-type")
         )
-        return ScoreResponse(scores=scores)
+    except UnsupportedMediaTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except SerializationError as e:
+        raise RequestValidationError(e.errors)
+
+    response_type = negotiate_response_type(request.headers.get("accept"))
+    if response_type is None:
+        raise HTTPException(status_code=406, detail="No acceptable response media type")
+    try:
+        scores = await fasttext_service.score_documents(model_id, documents)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    return Response(
+        content=encode_scores(scores, response_type),
+        media_type=response_type,
+        headers={"Vary": "Accept"}
+    )
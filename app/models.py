@@ -0,0 +1,12 @@
+from typing import List
+from pydantic import BaseModel
+
+class ScoreRequest(BaseModel):
+    model_id: str
+    documents: List[str]
+
+class ScoreResponse(BaseModel):
+    scores: List[float]
+
+class TrainResponse(BaseModel):
+    model_id: str
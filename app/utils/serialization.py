@@ -0,0 +1,242 @@
+import struct
+from typing import List, Optional, Tuple
+
+import msgpack
+import numpy as np
+import orjson
+from pydantic import ValidationError
+
+from ..models import ScoreRequest
+
+# Media types understood by the scoring endpoints
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+LENGTH_PREFIXED_MEDIA_TYPE = "application/x-length-prefixed"
+FLOAT32_MEDIA_TYPE = "application/octet-stream"
+
+_MSGPACK_ALIASES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+_LENGTH_PREFIX = struct.Struct("<I")
+_SCORE_DTYPE = np.dtype("<f4")
+
+
+class SerializationError(ValueError):
+    """
+    Raised when a request body cannot be decoded.
+
+    `errors` holds Pydantic-style `{type, loc, msg, input}` entries so the API
+    can report them the same way FastAPI reports request validation failures.
+    """
+
+    def __init__(self, message: str, errors: Optional[List[dict]] = None):
+        super().__init__(message)
+        self.errors = errors if errors is not None else [
+            {"type": "value_error", "loc": ("body",), "msg": message, "input": None}
+        ]
+
+
+class UnsupportedMediaTypeError(SerializationError):
+    """Raised when the request Content-Type is not a supported encoding"""
+
+
+def _media_type(header: Optional[str]) -> str:
+    """Strip parameters (charset etc.) and normalize a Content-Type/Accept entry"""
+    if not header:
+        return ""
+    return header.split(";", 1)[0].strip().lower()
+
+
+def _jsonable_input(value):
+    """Replace bytes (msgpack bin values) in an error input so FastAPI can render it"""
+    if isinstance(value, (bytes, bytearray)):
+        return repr(bytes(value))
+    if isinstance(value, dict):
+        return {_jsonable_input(key): _jsonable_input(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable_input(item) for item in value]
+    return value
+
+
+def _validate(payload) -> Tuple[str, List[str]]:
+    """
+    Cheap type checks for a decoded JSON/msgpack payload.
+
+    Only when they fail is the payload handed to ScoreRequest, which produces
+    the same error list a Pydantic-validated body would. Validation is strict
+    so msgpack bin values are rejected rather than coerced to str.
+    """
+    if isinstance(payload, dict):
+        model_id = payload.get("model_id")
+        documents = payload.get("documents")
+        if (isinstance(model_id, str) and isinstance(documents, list)
+                and all(isinstance(doc, str) for doc in documents)):
+            return model_id, documents
+    try:
+        request = ScoreRequest.model_validate(payload, strict=True, from_attributes=True)
+    except ValidationError as e:
+        errors = [
+            {**error, "loc": ("body", *error["loc"]), "input": _jsonable_input(error["input"])}
+            for error in e.errors()
+        ]
+        raise SerializationError("Invalid request body", errors) from e
+    return request.model_id, request.documents
+
+
+def encode_length_prefixed(model_id: str, documents: List[str]) -> bytes:
+    """
+    Encode a score request as length-prefixed frames.
+
+    Every frame is a little-endian uint32 byte length followed by UTF-8 text.
+    The first frame is the model id, each remaining frame is one document.
+    """
+    parts = []
+    for text in [model_id, *documents]:
+        data = text.encode("utf-8")
+        parts.append(_LENGTH_PREFIX.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_length_prefixed(body: bytes) -> Tuple[str, List[str]]:
+    """Decode a body produced by encode_length_prefixed"""
+    body = bytes(body)
+    frames = []
+    offset = 0
+    end = len(body)
+    prefix_size = _LENGTH_PREFIX.size
+    unpack_from = _LENGTH_PREFIX.unpack_from
+    try:
+        while offset < end:
+            if offset + prefix_size > end:
+                raise SerializationError("Truncated length prefix")
+            (length,) = unpack_from(body, offset)
+            offset += prefix_size
+            if offset + length > end:
+                raise SerializationError("Frame length exceeds body size")
+            frames.append(body[offset:offset + length].decode("utf-8"))
+            offset += length
+    except UnicodeDecodeError as e:
+        raise SerializationError(f"Invalid UTF-8 in frame: {e}") from e
+    if not frames:
+        raise SerializationError("Missing model_id frame")
+    return frames[0], frames[1:]
+
+
+def decode_score_request(body: bytes, content_type: Optional[str]) -> Tuple[str, List[str]]:
+    """
+    Decode a /score request body according to its Content-Type.
+
+    Returns:
+        Tuple of (model_id, documents)
+    """
+    media_type = _media_type(content_type)
+    if media_type == LENGTH_PREFIXED_MEDIA_TYPE:
+        return decode_length_prefixed(body)
+
+    if media_type in _MSGPACK_ALIASES:
+        try:
+            payload = msgpack.unpackb(body, raw=False)
+        except Exception as e:
+            raise SerializationError(f"Invalid msgpack body: {e}") from e
+    elif media_type in ("", JSON_MEDIA_TYPE):
+        try:
+            payload = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise SerializationError(f"Invalid JSON body: {e}", [{
+                "type": "json_invalid",
+                "loc": ("body", e.pos),
+                "msg": "JSON decode error",
+                "input": {},
+                "ctx": {"error": e.msg},
+            }]) from e
+    else:
+        raise UnsupportedMediaTypeError(f"Unsupported Content-Type: {content_type}")
+
+    return _validate(payload)
+
+
+def _quality(entry: str) -> float:
+    """Read the q parameter of an Accept entry (1.0 when absent or malformed)"""
+    for param in entry.split(";")[1:]:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return min(max(float(value.strip()), 0.0), 1.0)
+            except ValueError:
+                return 1.0
+    return 1.0
+
+
+# Response types in server preference order, with the Accept entries naming each
+_RESPONSE_TYPES = [
+    (JSON_MEDIA_TYPE, {JSON_MEDIA_TYPE}),
+    (MSGPACK_MEDIA_TYPE, _MSGPACK_ALIASES),
+    (FLOAT32_MEDIA_TYPE, {FLOAT32_MEDIA_TYPE}),
+]
+
+
+def negotiate_response_type(accept: Optional[str]) -> Optional[str]:
+    """
+    Pick the response media type from an Accept header.
+
+    Each supported type takes the q-value of its most specific matching entry
+    (exact type, then application/*, then */*). The highest q wins, header order
+    breaks ties, then server preference (JSON, msgpack, float32). A type with
+    q=0 is never chosen. If no type gets a positive q, the first type the header
+    does not mention is used, so a missing or unrelated header yields JSON.
+
+    Returns:
+        The media type, or None when every supported type was refused
+    """
+    entries = []
+    for index, entry in enumerate((accept or "").split(",")):
+        media_type = _media_type(entry)
+        if media_type:
+            entries.append((media_type, _quality(entry), index))
+
+    def match(aliases):
+        for names in (aliases, {"application/*"}, {"*/*"}):
+            matches = [(q, index) for media_type, q, index in entries if media_type in names]
+            if matches:
+                return max(matches, key=lambda m: (m[0], -m[1]))
+        return None
+
+    best, best_key, unmentioned = None, None, []
+    for rank, (response_type, aliases) in enumerate(_RESPONSE_TYPES):
+        matched = match(aliases)
+        if matched is None:
+            unmentioned.append(response_type)
+            continue
+        q, index = matched
+        key = (q, -index, -rank)
+        if q > 0 and (best_key is None or key > best_key):
+            best, best_key = response_type, key
+    if best is not None:
+        return best
+    return unmentioned[0] if unmentioned else None
+
+
+def encode_scores(scores: List[float], media_type: str) -> bytes:
+    """
+    Serialize scores for the negotiated response media type.
+
+    JSON and msgpack keep full float64 precision; only the packed array is float32.
+    """
+    if media_type == FLOAT32_MEDIA_TYPE:
+        return np.asarray(scores, dtype=_SCORE_DTYPE).tobytes()
+    if media_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb({"scores": scores})
+    return orjson.dumps({"scores": scores}, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def decode_scores(body: bytes, media_type: str) -> np.ndarray:
+    """
+    Client-side helper: parse a /score response body into a numpy array.
+
+    Packed responses decode to float32; JSON and msgpack decode to float64.
+    """
+    media_type = _media_type(media_type)
+    if media_type == FLOAT32_MEDIA_TYPE:
+        return np.frombuffer(body, dtype=_SCORE_DTYPE)
+    if media_type in _MSGPACK_ALIASES:
+        return np.asarray(msgpack.unpackb(body, raw=False)["scores"], dtype=np.float64)
+    return np.asarray(orjson.loads(body)["scores"], dtype=np.float64)
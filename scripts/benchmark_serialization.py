@@ -0,0 +1,175 @@
+"""
+Compare /score wire formats across batch sizes.
+
+Two tables are printed:
+  * server-side request decode, the cost paid per request before scoring starts
+  * the full serialization round trip (client encodes the request, server
+    decodes it, server encodes the scores, client decodes them)
+
+Neither needs a running server. Pass --model-id of a model in trained_models/
+to add an inference column timed through FastTextService.score_documents, so
+serialization can be compared against the cost of scoring itself.
+
+Usage:
+    python scripts/benchmark_serialization.py [--repeat N] [--doc-length CHARS] [--model-id UUID]
+"""
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+import time
+
+import msgpack
+import orjson
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.models import ScoreRequest, ScoreResponse  # noqa: E402
+from app.utils.serialization import (  # noqa: E402
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    LENGTH_PREFIXED_MEDIA_TYPE,
+    FLOAT32_MEDIA_TYPE,
+    decode_score_request,
+    encode_length_prefixed,
+    encode_scores,
+    decode_scores,
+)
+
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 50_000]
+MODEL_ID = "c42970a2-6307-4f33-9439-51fc69909406"
+
+
+def make_documents(n, doc_length):
+    words = ["".join(random.choices(string.ascii_lowercase, k=random.randint(2, 10))) for _ in range(500)]
+    docs = []
+    for _ in range(n):
+        doc = []
+        size = 0
+        while size < doc_length:
+            word = random.choice(words)
+            doc.append(word)
+            size += len(word) + 1
+        docs.append(" ".join(doc))
+    return docs
+
+
+def encode_request(request_type, docs):
+    if request_type == LENGTH_PREFIXED_MEDIA_TYPE:
+        return encode_length_prefixed(MODEL_ID, docs)
+    if request_type == MSGPACK_MEDIA_TYPE:
+        return msgpack.packb({"model_id": MODEL_ID, "documents": docs})
+    return orjson.dumps({"model_id": MODEL_ID, "documents": docs})
+
+
+def pydantic_roundtrip(docs, scores):
+    """Baseline: the original Pydantic-validated JSON path"""
+    body = ScoreRequest(model_id=MODEL_ID, documents=docs).model_dump_json()
+    ScoreRequest.model_validate_json(body)
+    payload = ScoreResponse(scores=scores).model_dump_json()
+    ScoreResponse.model_validate_json(payload)
+
+
+def make_roundtrip(request_type, response_type):
+    def roundtrip(docs, scores):
+        body = encode_request(request_type, docs)
+        decode_score_request(body, request_type)
+        payload = encode_scores(scores, response_type)
+        decode_scores(payload, response_type)
+    return roundtrip
+
+
+ROUNDTRIPS = {
+    "pydantic json": pydantic_roundtrip,
+    "orjson": make_roundtrip(JSON_MEDIA_TYPE, JSON_MEDIA_TYPE),
+    "msgpack": make_roundtrip(MSGPACK_MEDIA_TYPE, MSGPACK_MEDIA_TYPE),
+    "length-prefixed/f32": make_roundtrip(LENGTH_PREFIXED_MEDIA_TYPE, FLOAT32_MEDIA_TYPE),
+}
+
+# Server-side decoders, keyed like ROUNDTRIPS; values are (request encoder, decoder)
+DECODERS = {
+    "pydantic json": (
+        lambda docs: ScoreRequest(model_id=MODEL_ID, documents=docs).model_dump_json(),
+        ScoreRequest.model_validate_json,
+    ),
+    **{
+        name: (
+            lambda docs, request_type=request_type: encode_request(request_type, docs),
+            lambda body, request_type=request_type: decode_score_request(body, request_type),
+        )
+        for name, request_type in [
+            ("orjson", JSON_MEDIA_TYPE),
+            ("msgpack", MSGPACK_MEDIA_TYPE),
+            ("length-prefixed", LENGTH_PREFIXED_MEDIA_TYPE),
+        ]
+    },
+}
+
+
+def best_time(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def print_table(title, columns, rows):
+    header = f"{'batch':>8} " + " ".join(f"{name:>20}" for name in columns)
+    print(title)
+    print(header)
+    print("-" * len(header))
+    for n, row in rows:
+        print(f"{n:>8} " + " ".join(f"{ms:>20.3f}" for ms in row))
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is reported)")
+    parser.add_argument("--doc-length", type=int, default=2000, help="Approximate characters per document")
+    parser.add_argument("--model-id", help="Trained model to time inference against")
+    args = parser.parse_args()
+
+    service = None
+    if args.model_id:
+        from app.services.fasttext_service import FastTextService
+        service = FastTextService()
+
+    random.seed(0)
+    all_docs = make_documents(max(BATCH_SIZES), args.doc_length)
+    all_scores = [random.random() for _ in all_docs]
+
+    decode_columns = list(DECODERS) + (["inference"] if service else [])
+    decode_rows = []
+    roundtrip_rows = []
+    for n in BATCH_SIZES:
+        docs, scores = all_docs[:n], all_scores[:n]
+
+        row = []
+        for encode, decode in DECODERS.values():
+            body = encode(docs)
+            row.append(best_time(lambda: decode(body), args.repeat))
+        if service:
+            row.append(best_time(
+                lambda: asyncio.run(service.score_documents(args.model_id, docs)), args.repeat
+            ))
+        decode_rows.append((n, row))
+
+        roundtrip_rows.append((n, [
+            best_time(lambda: fn(docs, scores), args.repeat) for fn in ROUNDTRIPS.values()
+        ]))
+
+    print_table(
+        f"Server-side request decode, milliseconds (best of {args.repeat})", decode_columns, decode_rows
+    )
+    print_table(
+        f"Round-trip serialization, milliseconds (best of {args.repeat})", list(ROUNDTRIPS), roundtrip_rows
+    )
+
+
+if __name__ == "__main__":
+    main()
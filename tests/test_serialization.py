@@ -0,0 +1,272 @@
+import importlib
+import struct
+
+import msgpack
+import numpy as np
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+
+from app.utils.serialization import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    LENGTH_PREFIXED_MEDIA_TYPE,
+    FLOAT32_MEDIA_TYPE,
+    SerializationError,
+    UnsupportedMediaTypeError,
+    decode_length_prefixed,
+    decode_score_request,
+    decode_scores,
+    encode_length_prefixed,
+    encode_scores,
+    negotiate_response_type,
+)
+
+MODEL_ID = "test-model"
+DOCUMENTS = ["first document", "ünïcödé text", ""]
+SCORES = [0.1, 0.5, 0.9]
+
+
+# Request decoding
+
+def test_length_prefixed_roundtrip():
+    body = encode_length_prefixed(MODEL_ID, DOCUMENTS)
+    assert decode_length_prefixed(body) == (MODEL_ID, DOCUMENTS)
+
+
+def test_length_prefixed_frame_layout():
+    body = encode_length_prefixed("m", ["ab"])
+    assert body == struct.pack("<I", 1) + b"m" + struct.pack("<I", 2) + b"ab"
+
+
+def test_length_prefixed_without_documents():
+    assert decode_length_prefixed(encode_length_prefixed(MODEL_ID, [])) == (MODEL_ID, [])
+
+
+@pytest.mark.parametrize("body", [
+    b"",
+    struct.pack("<I", 1)[:2],
+    struct.pack("<I", 10) + b"short",
+    struct.pack("<I", 2) + b"\xff\xfe",
+])
+def test_length_prefixed_malformed(body):
+    with pytest.raises(SerializationError):
+        decode_length_prefixed(body)
+
+
+@pytest.mark.parametrize("content_type, body", [
+    (JSON_MEDIA_TYPE, orjson.dumps({"model_id": MODEL_ID, "documents": DOCUMENTS})),
+    ("application/json; charset=utf-8", orjson.dumps({"model_id": MODEL_ID, "documents": DOCUMENTS})),
+    (None, orjson.dumps({"model_id": MODEL_ID, "documents": DOCUMENTS})),
+    (MSGPACK_MEDIA_TYPE, msgpack.packb({"model_id": MODEL_ID, "documents": DOCUMENTS})),
+    ("application/x-msgpack", msgpack.packb({"model_id": MODEL_ID, "documents": DOCUMENTS})),
+    (LENGTH_PREFIXED_MEDIA_TYPE, encode_length_prefixed(MODEL_ID, DOCUMENTS)),
+])
+def test_decode_score_request(content_type, body):
+    assert decode_score_request(body, content_type) == (MODEL_ID, DOCUMENTS)
+
+
+def test_decode_score_request_unsupported_type():
+    with pytest.raises(UnsupportedMediaTypeError):
+        decode_score_request(b"model_id=x", "application/x-www-form-urlencoded")
+
+
+def test_decode_score_request_invalid_json():
+    with pytest.raises(SerializationError) as exc_info:
+        decode_score_request(b"{not json", JSON_MEDIA_TYPE)
+    assert exc_info.value.errors[0]["type"] == "json_invalid"
+
+
+def test_decode_score_request_invalid_msgpack():
+    with pytest.raises(SerializationError):
+        decode_score_request(b"\xc1", MSGPACK_MEDIA_TYPE)
+
+
+@pytest.mark.parametrize("payload, loc, error_type", [
+    ({"documents": DOCUMENTS}, ("body", "model_id"), "missing"),
+    ({"model_id": MODEL_ID}, ("body", "documents"), "missing"),
+    ({"model_id": MODEL_ID, "documents": ["ok", 3]}, ("body", "documents", 1), "string_type"),
+    ({"model_id": 1, "documents": DOCUMENTS}, ("body", "model_id"), "string_type"),
+    (["not", "an", "object"], ("body",), "model_attributes_type"),
+])
+def test_decode_score_request_validation_errors(payload, loc, error_type):
+    for content_type, body in [
+        (JSON_MEDIA_TYPE, orjson.dumps(payload)),
+        (MSGPACK_MEDIA_TYPE, msgpack.packb(payload)),
+    ]:
+        with pytest.raises(SerializationError) as exc_info:
+            decode_score_request(body, content_type)
+        error = exc_info.value.errors[0]
+        assert error["loc"] == loc
+        assert error["type"] == error_type
+
+
+@pytest.mark.parametrize("payload, loc", [
+    ({"model_id": b"\xff", "documents": []}, ("body", "model_id")),
+    ({"model_id": MODEL_ID, "documents": [b"\xff"]}, ("body", "documents", 0)),
+    ({"model_id": MODEL_ID, "documents": [b"valid utf-8"]}, ("body", "documents", 0)),
+])
+def test_decode_score_request_rejects_msgpack_bin(payload, loc):
+    with pytest.raises(SerializationError) as exc_info:
+        decode_score_request(msgpack.packb(payload, use_bin_type=True), MSGPACK_MEDIA_TYPE)
+    error = exc_info.value.errors[0]
+    assert error["loc"] == loc
+    assert error["type"] == "string_type"
+    assert not isinstance(error["input"], bytes)
+
+
+# Response negotiation and encoding
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, JSON_MEDIA_TYPE),
+    ("", JSON_MEDIA_TYPE),
+    ("*/*", JSON_MEDIA_TYPE),
+    ("text/html", JSON_MEDIA_TYPE),
+    (JSON_MEDIA_TYPE, JSON_MEDIA_TYPE),
+    (MSGPACK_MEDIA_TYPE, MSGPACK_MEDIA_TYPE),
+    ("application/vnd.msgpack", MSGPACK_MEDIA_TYPE),
+    (FLOAT32_MEDIA_TYPE, FLOAT32_MEDIA_TYPE),
+    ("application/octet-stream;q=0, application/json", JSON_MEDIA_TYPE),
+    ("application/json;q=0.1, application/msgpack", MSGPACK_MEDIA_TYPE),
+    ("application/msgpack;q=0.5, application/octet-stream;q=0.9", FLOAT32_MEDIA_TYPE),
+    ("application/msgpack, application/octet-stream", MSGPACK_MEDIA_TYPE),
+    ("application/octet-stream;q=0.8, */*;q=0.1", FLOAT32_MEDIA_TYPE),
+    ("application/msgpack;q=0", JSON_MEDIA_TYPE),
+    ("application/msgpack;q=bogus", MSGPACK_MEDIA_TYPE),
+    ("application/json;q=0, */*", MSGPACK_MEDIA_TYPE),
+    ("application/json;q=0, application/*;q=0.5, application/octet-stream", FLOAT32_MEDIA_TYPE),
+    ("application/json;q=0", MSGPACK_MEDIA_TYPE),
+    ("*/*;q=0, application/octet-stream", FLOAT32_MEDIA_TYPE),
+    ("*/*;q=0", None),
+    ("application/json;q=0, application/msgpack;q=0, application/octet-stream;q=0", None),
+])
+def test_negotiate_response_type(accept, expected):
+    assert negotiate_response_type(accept) == expected
+
+
+def test_float32_scores_are_packed():
+    body = encode_scores(SCORES, FLOAT32_MEDIA_TYPE)
+    assert len(body) == 4 * len(SCORES)
+    decoded = decode_scores(body, FLOAT32_MEDIA_TYPE)
+    assert decoded.dtype == np.float32
+    np.testing.assert_allclose(decoded, SCORES, rtol=1e-6)
+
+
+@pytest.mark.parametrize("media_type", [JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE])
+def test_json_and_msgpack_scores_keep_full_precision(media_type):
+    decoded = decode_scores(encode_scores(SCORES, media_type), media_type)
+    assert decoded.dtype == np.float64
+    assert decoded.tolist() == SCORES
+
+
+def test_msgpack_scores_match_json():
+    assert msgpack.unpackb(encode_scores(SCORES, MSGPACK_MEDIA_TYPE)) == \
+        orjson.loads(encode_scores(SCORES, JSON_MEDIA_TYPE))
+
+
+# /score endpoint
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # Importing app.main creates the service, which writes logs and model dirs under cwd
+    monkeypatch.chdir(tmp_path)
+    main = importlib.import_module("app.main")
+
+    async def fake_score_documents(model_id, documents):
+        if model_id != MODEL_ID:
+            raise ValueError(f"Model {model_id} not found")
+        return SCORES[:len(documents)]
+
+    monkeypatch.setattr(main.fasttext_service, "score_documents", fake_score_documents)
+    return TestClient(main.app)
+
+
+REQUEST_BODIES = {
+    JSON_MEDIA_TYPE: orjson.dumps({"model_id": MODEL_ID, "documents": DOCUMENTS}),
+    MSGPACK_MEDIA_TYPE: msgpack.packb({"model_id": MODEL_ID, "documents": DOCUMENTS}),
+    LENGTH_PREFIXED_MEDIA_TYPE: encode_length_prefixed(MODEL_ID, DOCUMENTS),
+}
+
+
+@pytest.mark.parametrize("content_type", list(REQUEST_BODIES))
+@pytest.mark.parametrize("accept", [JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, FLOAT32_MEDIA_TYPE])
+def test_score_formats(client, content_type, accept):
+    response = client.post(
+        "/score",
+        content=REQUEST_BODIES[content_type],
+        headers={"Content-Type": content_type, "Accept": accept},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].split(";")[0] == accept
+    assert response.headers["vary"] == "Accept"
+    if accept == FLOAT32_MEDIA_TYPE:
+        np.testing.assert_allclose(np.frombuffer(response.content, dtype="<f4"), SCORES, rtol=1e-6)
+    elif accept == MSGPACK_MEDIA_TYPE:
+        assert msgpack.unpackb(response.content) == {"scores": SCORES}
+    else:
+        assert response.json() == {"scores": SCORES}
+
+
+def test_score_json_defaults(client):
+    response = client.post("/score", json={"model_id": MODEL_ID, "documents": DOCUMENTS})
+    assert response.status_code == 200
+    assert response.json() == {"scores": SCORES}
+
+
+def test_score_unsupported_content_type(client):
+    response = client.post("/score", content=b"x", headers={"Content-Type": "text/plain"})
+    assert response.status_code == 415
+
+
+def test_score_missing_field_returns_422(client):
+    response = client.post("/score", json={"documents": DOCUMENTS})
+    assert response.status_code == 422
+    error = response.json()["detail"][0]
+    assert error["loc"] == ["body", "model_id"]
+    assert error["type"] == "missing"
+    assert "msg" in error
+
+
+@pytest.mark.parametrize("payload", [
+    {"model_id": b"\xff", "documents": []},
+    {"model_id": MODEL_ID, "documents": [b"\xff"]},
+    {"documents": [b"\xff"]},
+])
+def test_score_msgpack_bin_returns_422(client, payload):
+    response = client.post(
+        "/score",
+        content=msgpack.packb(payload, use_bin_type=True),
+        headers={"Content-Type": MSGPACK_MEDIA_TYPE},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][0] == "body"
+
+
+def test_score_all_types_refused_returns_406(client):
+    response = client.post(
+        "/score",
+        json={"model_id": MODEL_ID, "documents": DOCUMENTS},
+        headers={"Accept": "*/*;q=0"},
+    )
+    assert response.status_code == 406
+
+
+def test_score_invalid_json_returns_422(client):
+    response = client.post("/score", content=b"{not json", headers={"Content-Type": JSON_MEDIA_TYPE})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+
+
+def test_score_malformed_frames_returns_422(client):
+    response = client.post(
+        "/score",
+        content=struct.pack("<I", 50) + b"short",
+        headers={"Content-Type": LENGTH_PREFIXED_MEDIA_TYPE},
+    )
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["body"]
+
+
+def test_score_unknown_model_returns_404(client):
+    response = client.post("/score", json={"model_id": "missing", "documents": DOCUMENTS})
+    assert response.status_code == 404